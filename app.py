@@ -1,22 +1,87 @@
+import itertools
+import os
+
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 
 from black_scholes_engine import (
-    black_scholes_price,
-    calculate_greeks,
-    calculate_pnl,
+    GREEK_OUTPUTS,
+    ADAPTIVE_BUDGET,
+    PROGRESSIVE_STAGES,
+    CancellationToken,
+    black_scholes_kernel,
+    generate_grid_adaptive,
+    generate_grid_progressive,
     generate_price_grid,
     generate_pnl_grid,
     implied_volatility
 )
+from engine_cache import cached_calculate_pnl, clear_engine_caches
+from grid_storage import open_cube_store
+from sensitivity_grid import SensitivityGrid
+from heatmap_render import render_heatmap
 
 # -------------------- Page Setup --------------------
 st.set_page_config(page_title="Black-Scholes Dashboard", layout="wide")
 st.markdown("<h1 style='text-align: center;'> Black-Scholes Option Pricing Dashboard - Auro</h1>", unsafe_allow_html=True)
 st.write("")  # spacing
 
+# -------------------- Cached Computations --------------------
+# Shared by every session on the server and keyed on the numeric inputs, so a
+# rerun or another analyst asking the same question skips the engine entirely.
+CACHE_TTL = 30 * 60  # seconds
+CACHE_MAX_ENTRIES = 256
+GRID_CACHE_MAX_ENTRIES = 8  # a 2000 x 2000 grid is 32 MB
+IMAGE_CACHE_MAX_ENTRIES = 64
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def price_and_greeks(S, K, T, r, sigma, option_type):
+    results = black_scholes_kernel(S, K, T, r, sigma, option_type)
+    return results['price'], tuple(results[g] for g in GREEK_OUTPUTS)
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def solve_iv(market_price, S, K, T, r, option_type):
+    return implied_volatility(market_price, S, K, T, r, option_type)
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=GRID_CACHE_MAX_ENTRIES, show_spinner="Computing grid...")
+def sensitivity_grid(heatmap_type, S_min, S_max, vol_min, vol_max, steps, K, T, r, purchase_price, option_type,
+                     adaptive_budget=0):
+    S_range = np.linspace(S_min, S_max, steps)
+    vol_range = np.linspace(vol_min, vol_max, steps)
+    # A zero-width span has nothing to refine, so it takes the uniform grid.
+    if adaptive_budget and S_max != S_min and vol_max != vol_min:
+        # Evaluate at most adaptive_budget points, concentrated where the surface
+        # bends, and interpolate them onto the display grid.
+        _, interpolant = generate_grid_adaptive(S_range, vol_range, K, T, r, option_type,
+                                                None if heatmap_type == "Option Price" else purchase_price,
+                                                budget=adaptive_budget)
+        values, _ = interpolant(S=S_range[np.newaxis, :], sigma=vol_range[:, np.newaxis])
+        return SensitivityGrid(values, {"sigma": vol_range, "S": S_range})
+    if heatmap_type == "Option Price":
+        return generate_price_grid(S_range, vol_range, K, T, r, option_type)
+    return generate_pnl_grid(S_range, vol_range, K, T, r, purchase_price, option_type)
+
+
+# Rendered heatmaps are cached as PNG bytes keyed by the grid inputs and colormap,
+# so a repeated request skips both the engine and matplotlib.
+@st.cache_data(ttl=CACHE_TTL, max_entries=IMAGE_CACHE_MAX_ENTRIES, show_spinner="Rendering heatmap...")
+def heatmap_image(heatmap_type, S_min, S_max, vol_min, vol_max, steps, K, T, r, purchase_price, option_type, cmap,
+                  adaptive_budget=0):
+    grid = sensitivity_grid(heatmap_type, S_min, S_max, vol_min, vol_max, steps,
+                            K, T, r, purchase_price, option_type, adaptive_budget)
+    if heatmap_type == "Option Price":
+        return render_heatmap(grid, "Option Price Heatmap", cmap)
+    return render_heatmap(grid, "P&L Heatmap", cmap, center=0)
+
+
+@st.cache_resource(ttl=CACHE_TTL, max_entries=8, show_spinner=False)
+def cube_store(path):
+    # Read-only and lazily mapped, so one instance can serve every session.
+    return open_cube_store(path)
+
 # -------------------- Sidebar --------------------
 st.sidebar.markdown("## ⚙️ Model Inputs")
 st.sidebar.markdown("Adjust parameters below to calculate option price and Greeks.")
@@ -30,6 +95,13 @@ option_type = st.sidebar.radio("**Option Type**", ["call", "put"])
 purchase_price = st.sidebar.number_input("**Purchase Price**", value=8.00)
 market_price = st.sidebar.number_input("**Observed Market Price (for IV)**", value=10.00)
 
+st.sidebar.markdown("---")
+if st.sidebar.button("Clear Cached Results", help="Drop cached grids, Greeks and IVs for every session."):
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    clear_engine_caches()
+    st.sidebar.success("Caches cleared.")
+
 # -------------------- Test Case --------------------
 with st.expander(" **Test Case Example: AAPL Option (Aug 2025)**", expanded=False):
     st.markdown("""
@@ -61,8 +133,7 @@ st.markdown("###  **Option Pricing & Greeks**")
 if T <= 0 or sigma <= 0:
     st.error(" Time to maturity (T) and volatility (σ) must be positive.")
 else:
-    option_price = black_scholes_price(S, K, T, r, sigma, option_type)
-    delta, gamma, vega, theta, rho = calculate_greeks(S, K, T, r, sigma, option_type)
+    option_price, (delta, gamma, vega, theta, rho) = price_and_greeks(S, K, T, r, sigma, option_type)
 
     col_price, col_greeks = st.columns([1.2, 1.5])
     with col_price:
@@ -79,7 +150,7 @@ else:
 st.divider()
 st.markdown("###  **Profit or Loss (P&L)**")
 
-pnl = calculate_pnl(S, K, T, r, sigma, purchase_price, option_type)
+pnl = cached_calculate_pnl(S, K, T, r, sigma, purchase_price, option_type)
 if pnl >= 0:
     st.success(f"**Profit:** ${pnl:.2f}")
 else:
@@ -102,38 +173,97 @@ if enable_analysis:
         vol_min = st.number_input("Min Volatility", value=0.1)
         vol_max = st.number_input("Max Volatility", value=0.5)
 
-    steps = st.slider("Resolution (Higher = More Detail)", min_value=5, max_value=50, value=20)
+    # Past 100 steps the heatmap is drawn as one raster image, so thousands of steps stay fast.
+    steps = st.slider("Resolution (Higher = More Detail)", min_value=5, max_value=2000, value=20)
     heatmap_type = st.radio("Heatmap Type", ["Option Price", "P&L"])
+    live = st.checkbox("Live Preview (coarse first, then refine)", value=False)
+    cmap = "coolwarm" if heatmap_type == "P&L" else "YlGnBu"
+
+    if live:
+        # Every input change redraws from a 16 x 16 preview up to full resolution.
+        # The previous run's token is cancelled so its remaining stages are dropped.
+        previous = st.session_state.get("heatmap_token")
+        if previous is not None:
+            previous.cancel()
+        token = st.session_state["heatmap_token"] = CancellationToken()
 
-    if st.button("Generate Heatmap"):
-        S_range = np.linspace(S_min, S_max, steps)
-        vol_range = np.linspace(vol_min, vol_max, steps)
-
-        if heatmap_type == "Option Price":
-            df = generate_price_grid(S_range, vol_range, K, T, r, option_type)
-            title = "Option Price Heatmap"
-            center_val = None
-        else:
-            df = generate_pnl_grid(S_range, vol_range, K, T, r, purchase_price, option_type)
-            title = "P&L Heatmap"
-            center_val = 0
-
-        fig, ax = plt.subplots(figsize=(9, 5))
-        sns.heatmap(df, cmap="coolwarm" if heatmap_type == "P&L" else "YlGnBu",
-                    center=center_val, annot=False, fmt=".2f", ax=ax)
-        ax.set_title(title, fontsize=14)
-        st.pyplot(fig)
+        inputs = (heatmap_type, S_min, S_max, vol_min, vol_max, steps, K, T, r, purchase_price, option_type, cmap)
+        placeholder = st.empty()
+        # Previews only when the inputs changed; a rerun from an unrelated widget
+        # goes straight to the cached full-resolution image.
+        if st.session_state.get("heatmap_live_inputs") != inputs:
+            is_pnl = heatmap_type == "P&L"
+            title = "P&L Heatmap" if is_pnl else "Option Price Heatmap"
+            stages = generate_grid_progressive(np.linspace(S_min, S_max, steps), np.linspace(vol_min, vol_max, steps),
+                                               K, T, r, option_type, purchase_price if is_pnl else None,
+                                               cancel=token)
+            previews = sum(1 for n in set(PROGRESSIVE_STAGES) if n < steps)
+            for grid in itertools.islice(stages, previews):
+                placeholder.image(render_heatmap(grid, title, cmap, center=0 if is_pnl else None))
+        # The full grid and image come from the same caches as the button path.
+        if not token.cancelled:
+            placeholder.image(heatmap_image(*inputs))
+            st.session_state["heatmap_live_inputs"] = inputs
+    else:
+        adaptive = st.checkbox("Adaptive Sampling (refine near the strike, interpolate the rest)", value=False)
+        budget = st.number_input("Point Budget", value=ADAPTIVE_BUDGET, min_value=81, step=512) if adaptive else 0
+        if st.button("Generate Heatmap"):
+            st.image(heatmap_image(heatmap_type, S_min, S_max, vol_min, vol_max, steps,
+                                   K, T, r, purchase_price, option_type, cmap, budget))
 
 # -------------------- Section D --------------------
 st.divider()
 st.markdown("###  **Implied Volatility (IV)**")
 
-iv = implied_volatility(market_price, S, K, T, r, option_type)
+iv = solve_iv(market_price, S, K, T, r, option_type)
 if iv is not None:
     st.info(f"**Implied Volatility:** {iv:.4f} ({iv*100:.2f}%)")
 else:
     st.warning("Could not calculate IV. Adjust inputs.")
 
+# -------------------- Section E --------------------
+st.divider()
+st.markdown("### 🗄️ **Precomputed Cube Browser**")
+
+enable_browser = st.checkbox("Browse a Precomputed Scenario Cube", value=False)
+
+if enable_browser:
+    st.markdown("Open a cube written by `grid_storage.write_cube_store` and slice it without recomputing.")
+    store_path = st.text_input("Cube store directory", value=os.environ.get("BS_CUBE_STORE", ""))
+
+    if store_path:
+        try:
+            store = cube_store(store_path)
+        except (FileNotFoundError, ValueError, KeyError) as exc:
+            st.error(f"Could not open cube store: {exc}")
+            store = None
+
+        if store is not None and len(store.dims) < 2:
+            st.warning("This cube has a single axis; there is no 2-D slice to plot.")
+        elif store is not None:
+            st.caption(f"{store.output} · {' × '.join(f'{d} ({len(store.axes[d])})' for d in store.dims)} · "
+                       f"{store.nbytes / 2 ** 20:,.1f} MB on disk")
+            col1, col2 = st.columns(2)
+            with col1:
+                rows = st.selectbox("Rows", store.dims,
+                                    index=store.dims.index("sigma") if "sigma" in store.dims else 0)
+            with col2:
+                col_choices = [d for d in store.dims if d != rows]
+                cols = st.selectbox("Columns", col_choices,
+                                    index=col_choices.index("S") if "S" in col_choices else 0)
+
+            # Every other axis gets a slider; moving one only changes which mapped view is plotted.
+            at = {}
+            for name in store.dims:
+                if name not in (rows, cols):
+                    at[name] = st.select_slider(f"{name}", options=list(store.axes[name]),
+                                                format_func=lambda v: v if isinstance(v, str) else f"{v:.4g}")
+
+            view = store.plane(rows, cols, **at)
+            title = f"{store.output.capitalize()} · " + ", ".join(
+                f"{k}={v if isinstance(v, str) else f'{v:.4g}'}" for k, v in at.items())
+            st.image(render_heatmap(view, title))
+
 # -------------------- Footer --------------------
 st.divider()
 st.markdown("""
@@ -0,0 +1,59 @@
+# Soak test for heatmap rendering: thousands of renders of distinct grids (so no
+# cache can help), sampling resident memory as it goes. heatmap_png should stay
+# flat; --pyplot replays the old app pattern (plt.subplots, never closed) to show
+# the figure registry growing.
+# Run from the repository root:  python -m benchmarks.heatmap_soak [renders] [--pyplot]
+import resource
+import sys
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import seaborn as sns
+
+import black_scholes_engine as engine
+from heatmap_render import heatmap_png
+
+RENDERS = 2000
+SAMPLES = 10
+STEPS = 20
+
+
+def current_rss_mb():
+    # Current (not peak) RSS from /proc on Linux; falls back to the peak elsewhere.
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * resource.getpagesize() / 2 ** 20
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10
+
+
+def render_pyplot(grid, title):
+    fig, ax = plt.subplots(figsize=(9, 5))
+    sns.heatmap(grid.to_frame(), cmap='YlGnBu', annot=False, ax=ax)
+    ax.set_title(title, fontsize=14)
+    fig.canvas.draw()
+
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    legacy = '--pyplot' in sys.argv[1:]
+    renders = int(args[0]) if args else RENDERS
+    render = render_pyplot if legacy else heatmap_png
+
+    S_range = np.linspace(80, 120, STEPS)
+    vol_range = np.linspace(0.1, 0.5, STEPS)
+    every = max(1, renders // SAMPLES)
+    print(f"{'renders':>8}{'rss (MB)':>10}{'figures':>9}{'ms/render':>11}"
+          f"   ({'pyplot, never closed' if legacy else 'heatmap_png'})")
+    start = time.perf_counter()
+    for i in range(1, renders + 1):
+        # A new strike every time, so each render is a genuinely new grid.
+        grid = engine.generate_price_grid(S_range, vol_range, 90 + 20 * i / renders, 1.0, 0.05)
+        render(grid, f"Render {i}")
+        if i % every == 0 or i == 1:
+            elapsed = (time.perf_counter() - start) / i * 1e3
+            print(f"{i:>8}{current_rss_mb():>10.1f}{len(plt.get_fignums()):>9}{elapsed:>11.1f}")
@@ -0,0 +1,53 @@
+# Peak memory and wall time of the full price + Greeks kernel on large batches:
+# plain NumPy vs the blocked numexpr backend.
+# Run from the repository root:  python -m benchmarks.numexpr_memory [sizes...]
+# Each measurement runs in a fresh interpreter, because peak RSS only ever grows.
+import json
+import resource
+import subprocess
+import sys
+import time
+
+import black_scholes_engine as engine
+
+SIZES = (1_000_000, 10_000_000)
+BACKENDS = ('numpy', 'numexpr')
+
+
+def peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10
+
+
+def measure(backend, size):
+    chain = engine._tuning_chain(size)
+    engine.black_scholes_kernel(*(a[:1000] for a in chain), backend=backend)
+    before = peak_rss_mb()
+    start = time.perf_counter()
+    engine.black_scholes_kernel(*chain, backend=backend)
+    elapsed = time.perf_counter() - start
+    return {'seconds': elapsed, 'peak_mb': peak_rss_mb() - before}
+
+
+def run_isolated(backend, size):
+    result = subprocess.run([sys.executable, '-m', 'benchmarks.numexpr_memory', '--child', backend, str(size)],
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ['--child']:
+        print(json.dumps(measure(sys.argv[2], int(sys.argv[3]))))
+        sys.exit(0)
+
+    if engine.numexpr is None:
+        sys.exit("numexpr is not installed.")
+    sizes = [int(s) for s in sys.argv[1:]] or SIZES
+    # Outputs alone are 6 float64 arrays; everything above that is scratch.
+    print(f"{'contracts':>12}{'backend':>10}{'time (s)':>11}{'peak (MB)':>12}{'outputs (MB)':>14}")
+    for size in sizes:
+        for backend in BACKENDS:
+            result = run_isolated(backend, size)
+            outputs_mb = len(engine.KERNEL_OUTPUTS) * 8 * size / 2 ** 20
+            print(f"{size:>12,}{backend:>10}{result['seconds']:>11.3f}{result['peak_mb']:>12.1f}{outputs_mb:>14.1f}")
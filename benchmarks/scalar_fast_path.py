@@ -0,0 +1,34 @@
+# Per-call latency of the single-contract API: NumPy backend vs the scalar 'math' fast path.
+# Run from the repository root:  python -m benchmarks.scalar_fast_path
+import timeit
+
+import black_scholes_engine as engine
+
+S, K, T, r, sigma, option_type = 100.0, 105.0, 0.5, 0.05, 0.2, 'call'
+market_price = engine.black_scholes_price(S, K, T, r, sigma, option_type)
+
+CASES = [
+    ("black_scholes_price",
+     lambda: engine.black_scholes_price(S, K, T, r, sigma, option_type, backend='numpy'),
+     lambda: engine.black_scholes_price(S, K, T, r, sigma, option_type)),
+    ("calculate_greeks",
+     lambda: engine.calculate_greeks(S, K, T, r, sigma, option_type, backend='numpy'),
+     lambda: engine.calculate_greeks(S, K, T, r, sigma, option_type)),
+    ("implied_volatility",
+     lambda: engine.implied_volatility(market_price, S, K, T, r, option_type, backend='numpy'),
+     lambda: engine.implied_volatility(market_price, S, K, T, r, option_type)),
+]
+
+
+def per_call_us(fn, repeat=5):
+    number, _ = timeit.Timer(fn).autorange()
+    best = min(timeit.repeat(fn, number=number, repeat=repeat))
+    return best / number * 1e6
+
+
+if __name__ == "__main__":
+    print(f"{'function':<22}{'numpy (us)':>14}{'math (us)':>14}{'speedup':>10}")
+    for name, numpy_path, fast_path in CASES:
+        t_numpy = per_call_us(numpy_path)
+        t_fast = per_call_us(fast_path)
+        print(f"{name:<22}{t_numpy:>14.2f}{t_fast:>14.2f}{t_numpy / t_fast:>9.1f}x")
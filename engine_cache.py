@@ -0,0 +1,148 @@
+import functools
+import inspect
+import math
+import numbers
+import threading
+from collections import OrderedDict, namedtuple
+
+from black_scholes_engine import (
+    black_scholes_price,
+    calculate_greeks,
+    calculate_pnl,
+    implied_volatility,
+)
+
+# Memoized engine calls for callers that ask the same question over and over,
+# like a Streamlit script rerun on every widget change. Float inputs are snapped
+# to a per-parameter tick before the lookup, and the function is evaluated at the
+# snapped values, so near-identical requests share one entry and a cached answer
+# never depends on which caller filled it first. Array inputs bypass the cache.
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'evictions', 'bypassed', 'maxsize', 'currsize'])
+
+ENGINE_CACHE_SIZE = 256
+PRICE_TICK = 1e-4    # spot, strike and premiums
+VOL_TICK = 1e-5
+RATE_TICK = 1e-6
+TIME_TICK = 1e-6     # years, about 30 seconds
+ENGINE_TICKS = {
+    'S': PRICE_TICK,
+    'K': PRICE_TICK,
+    'purchase_price': PRICE_TICK,
+    'market_price': PRICE_TICK,
+    'sigma': VOL_TICK,
+    'r': RATE_TICK,
+    'T': TIME_TICK,
+}
+
+
+def _quantize(value, tick):
+    # Returns (key, value to evaluate at). Real numbers land on the nearest
+    # multiple of the tick; bools and non-finite values are left alone.
+    if tick is None or isinstance(value, bool) or not isinstance(value, numbers.Real):
+        return value, value
+    value = float(value)
+    if not math.isfinite(value):
+        return value, value
+    steps = round(value / tick)
+    return steps, steps * tick
+
+
+# -------------------------
+# Memoize Decorator
+# -------------------------
+def memoize(maxsize=ENGINE_CACHE_SIZE, ticks=None):
+    # Bounded LRU keyed on the bound arguments (defaults filled in), with
+    # ticks = {parameter name: tick} quantizing those float parameters. Results
+    # are shared between callers, so wrap functions returning immutable values.
+    # The wrapper gets cache_info() and cache_clear(), like functools.lru_cache.
+    ticks = dict(ticks or {})
+    if maxsize is not None and maxsize < 1:
+        raise ValueError("maxsize must be a positive integer or None (unbounded).")
+
+    def decorator(fn):
+        signature = inspect.signature(fn)
+        unknown = set(ticks) - set(signature.parameters)
+        if unknown:
+            raise ValueError(f"{fn.__name__} has no parameters {sorted(unknown)} to quantize.")
+        entries = OrderedDict()
+        stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'bypassed': 0}
+        lock = threading.Lock()
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = []
+            for name, value in bound.arguments.items():
+                key_part, bound.arguments[name] = _quantize(value, ticks.get(name))
+                key.append(key_part)
+            key = tuple(key)
+            try:
+                hash(key)
+            except TypeError:
+                with lock:
+                    stats['bypassed'] += 1
+                return fn(*args, **kwargs)
+
+            with lock:
+                if key in entries:
+                    entries.move_to_end(key)
+                    stats['hits'] += 1
+                    return entries[key]
+                stats['misses'] += 1
+            # Evaluated outside the lock: two threads missing the same key both
+            # compute it, which is cheaper than serializing every engine call.
+            result = fn(*bound.args, **bound.kwargs)
+            with lock:
+                entries[key] = result
+                entries.move_to_end(key)
+                if maxsize is not None and len(entries) > maxsize:
+                    entries.popitem(last=False)
+                    stats['evictions'] += 1
+            return result
+
+        def cache_info():
+            with lock:
+                return CacheInfo(maxsize=maxsize, currsize=len(entries), **stats)
+
+        def cache_clear():
+            with lock:
+                entries.clear()
+                stats.update(hits=0, misses=0, evictions=0, bypassed=0)
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator
+
+
+# -------------------------
+# Memoized Engine Calls
+# -------------------------
+def _engine_ticks(fn):
+    parameters = inspect.signature(fn).parameters
+    return {name: tick for name, tick in ENGINE_TICKS.items() if name in parameters}
+
+
+cached_black_scholes_price = memoize(ticks=_engine_ticks(black_scholes_price))(black_scholes_price)
+cached_calculate_greeks = memoize(ticks=_engine_ticks(calculate_greeks))(calculate_greeks)
+cached_calculate_pnl = memoize(ticks=_engine_ticks(calculate_pnl))(calculate_pnl)
+cached_implied_volatility = memoize(ticks=_engine_ticks(implied_volatility))(implied_volatility)
+
+CACHED_CALLS = {
+    'black_scholes_price': cached_black_scholes_price,
+    'calculate_greeks': cached_calculate_greeks,
+    'calculate_pnl': cached_calculate_pnl,
+    'implied_volatility': cached_implied_volatility,
+}
+
+
+def cache_stats():
+    return {name: fn.cache_info() for name, fn in CACHED_CALLS.items()}
+
+
+def clear_engine_caches():
+    for fn in CACHED_CALLS.values():
+        fn.cache_clear()
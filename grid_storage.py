@@ -0,0 +1,219 @@
+import itertools
+import json
+import os
+
+import numpy as np
+
+from black_scholes_engine import (
+    CUBE_MEMORY_BUDGET,
+    CUBE_PARAMS,
+    KERNEL_OUTPUTS,
+    KERNEL_PEAK_ARRAYS,
+    _cube_axes,
+    _cube_block_inputs,
+    _cube_blocks,
+    _cube_split,
+    _float_dtype,
+    black_scholes_kernel,
+    generate_scenario_cube,
+)
+from sensitivity_grid import SensitivityGrid, _axis_index
+
+# Out-of-core scenario cubes. A store is a directory holding manifest.json plus
+# either one .npy file opened as a memory map ('memmap' layout) or a regular grid
+# of .npy chunk files ('chunks' layout). The writer evaluates and flushes the cube
+# piece by piece, so only one chunk's working set is ever in RAM; readers map just
+# the files a slice touches.
+
+MANIFEST_NAME = 'manifest.json'
+VALUES_NAME = 'values.npy'
+CHUNK_BYTES = 64 * 2 ** 20
+STORE_LAYOUTS = ('chunks', 'memmap')
+
+
+def _chunk_name(chunk_index):
+    return 'chunk_' + '_'.join(str(i) for i in chunk_index) + '.npy'
+
+
+def _json_value(value):
+    # NumPy scalars and 0-d arrays (valid fixed inputs) as plain JSON values.
+    return np.asarray(value).tolist() if isinstance(value, (np.generic, np.ndarray)) else value
+
+
+# -------------------------
+# Writer
+# -------------------------
+def write_cube_store(path, S, K, T, r, sigma, option_type='call', dims=None, output='price',
+                     layout='chunks', chunk_bytes=CHUNK_BYTES, memory_budget=CUBE_MEMORY_BUDGET,
+                     dtype=np.float64, overwrite=False):
+    # Same axis rules as generate_scenario_cube. chunk_bytes caps the size of one
+    # chunk file, memory_budget the kernel's working set while writing it.
+    if layout not in STORE_LAYOUTS:
+        raise ValueError(f"Invalid layout '{layout}'. Use one of {STORE_LAYOUTS}.")
+    if output not in KERNEL_OUTPUTS:
+        raise ValueError(f"Unknown output '{output}'. Choose from {KERNEL_OUTPUTS}.")
+    manifest_path = os.path.join(path, MANIFEST_NAME)
+    if os.path.exists(manifest_path):
+        if not overwrite:
+            raise FileExistsError(f"{path} already holds a cube store; pass overwrite=True to replace it.")
+        # Drop the manifest first so a half-rewritten store never looks complete.
+        os.remove(manifest_path)
+    os.makedirs(path, exist_ok=True)
+
+    dtype = _float_dtype(dtype)
+    params = dict(zip(CUBE_PARAMS, (S, K, T, r, sigma, option_type)))
+    axes, fixed = _cube_axes(params, dims)
+    shape = tuple(len(coords) for coords in axes.values())
+    manifest = {
+        'layout': layout,
+        'output': output,
+        'dtype': dtype.str,
+        'shape': list(shape),
+        'axes': {name: [_json_value(v) for v in coords] for name, coords in axes.items()},
+        'fixed': {name: _json_value(value) for name, value in fixed.items()},
+    }
+
+    if layout == 'chunks':
+        max_points = max(1, min(chunk_bytes // dtype.itemsize,
+                                memory_budget // (dtype.itemsize * KERNEL_PEAK_ARRAYS)))
+        split, run = _cube_split(shape, max_points)
+        manifest['chunk_shape'] = [1] * split + [min(run, shape[split])] + list(shape[split + 1:])
+    # Serialized before anything is evaluated, so a bad input fails fast.
+    manifest_text = json.dumps(manifest, indent=2)
+
+    if layout == 'memmap':
+        values = np.lib.format.open_memmap(os.path.join(path, VALUES_NAME), mode='w+', dtype=dtype, shape=shape)
+        generate_scenario_cube(S, K, T, r, sigma, option_type, dims, output, memory_budget, dtype, out=values)
+        values.flush()
+        del values
+    else:
+        for block in _cube_blocks(shape, max_points):
+            args = _cube_block_inputs(axes, fixed, block)
+            values = np.asarray(black_scholes_kernel(*args, outputs=(output,), dtype=dtype)[output])
+            # Pinned leading axes are kept as length-1 dimensions in the file.
+            chunk_index = block[:split] + (block[split].start // run,) + (0,) * (len(shape) - split - 1)
+            np.save(os.path.join(path, _chunk_name(chunk_index)), values.reshape((1,) * split + values.shape))
+
+    # Written aside and renamed into place, so manifest.json is always complete.
+    with open(manifest_path + '.tmp', 'w') as f:
+        f.write(manifest_text)
+    os.replace(manifest_path + '.tmp', manifest_path)
+    return CubeStore(path)
+
+
+# -------------------------
+# Reader
+# -------------------------
+class CubeStore:
+    # Lazy view of a store written by write_cube_store. Nothing is read until it
+    # is indexed; store[...] takes positions, store.sel(...) takes axis values
+    # (same rules as SensitivityGrid.sel). Both return SensitivityGrid objects
+    # whose values are memory-mapped views when the slice lies in one file.
+    def __init__(self, path):
+        manifest_path = os.path.join(path, MANIFEST_NAME)
+        if not os.path.exists(manifest_path):
+            raise FileNotFoundError(f"No cube store at {path}: {MANIFEST_NAME} is missing "
+                                    "(the write may not have finished).")
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        self.path = path
+        self.layout = manifest['layout']
+        self.output = manifest['output']
+        self.dtype = np.dtype(manifest['dtype'])
+        self.shape = tuple(manifest['shape'])
+        self.axes = {name: np.asarray(coords) for name, coords in manifest['axes'].items()}
+        self.fixed = manifest['fixed']
+        self.chunk_shape = tuple(manifest.get('chunk_shape', self.shape))
+
+    @property
+    def dims(self):
+        return tuple(self.axes)
+
+    @property
+    def nbytes(self):
+        return int(np.prod(self.shape)) * self.dtype.itemsize
+
+    def __repr__(self):
+        axes = ', '.join(f"{name}: {len(coords)}" for name, coords in self.axes.items())
+        return f"CubeStore({self.path!r}, {self.layout}, {self.output}, {axes})"
+
+    def memmap(self):
+        # The whole cube as one read-only memory map ('memmap' layout only).
+        if self.layout != 'memmap':
+            raise ValueError("memmap() needs a store written with layout='memmap'; index the store instead.")
+        return np.load(os.path.join(self.path, VALUES_NAME), mmap_mode='r')
+
+    def chunk(self, chunk_index):
+        return np.load(os.path.join(self.path, _chunk_name(chunk_index)), mmap_mode='r')
+
+    def sel(self, **indexers):
+        unknown = set(indexers) - set(self.axes)
+        if unknown:
+            raise ValueError(f"Unknown axes: {sorted(unknown)}. Store axes are {self.dims}.")
+        return self[tuple(_axis_index(coords, indexers[name]) if name in indexers else slice(None)
+                          for name, coords in self.axes.items())]
+
+    def plane(self, rows, cols, **at):
+        # 2-D slice with `rows` down and `cols` across, every other axis pinned by
+        # value through `at`; transposing keeps it a view, so nothing is copied.
+        others = set(self.axes) - {rows, cols}
+        if rows == cols or {rows, cols} - set(self.axes) or set(at) != others:
+            raise ValueError(f"plane() needs two distinct axes of {self.dims} and a value for each of the others.")
+        view = self.sel(**at)
+        if view.dims == (cols, rows):
+            view = SensitivityGrid(view.values.T, {rows: view.axes[rows], cols: view.axes[cols]})
+        return view
+
+    def __getitem__(self, index):
+        index = index if isinstance(index, tuple) else (index,)
+        if len(index) > len(self.shape):
+            raise IndexError(f"Too many indices for a {len(self.shape)}-D cube.")
+        index = index + (slice(None),) * (len(self.shape) - len(index))
+
+        bounds = []
+        for key, size in zip(index, self.shape):
+            if isinstance(key, slice):
+                start, stop, step = key.indices(size)
+                if step != 1:
+                    raise IndexError("Cube stores only support contiguous slices.")
+                bounds.append((start, max(start, stop)))
+            else:
+                i = int(key) + size if int(key) < 0 else int(key)
+                if not 0 <= i < size:
+                    raise IndexError(f"Index {key} is out of range for an axis of length {size}.")
+                bounds.append((i, i + 1))
+        axes = {name: coords[lo:hi] for (name, coords), key, (lo, hi) in zip(self.axes.items(), index, bounds)
+                if isinstance(key, slice)}
+
+        if self.layout == 'memmap':
+            values = self.memmap()[tuple(slice(lo, hi) for lo, hi in bounds)]
+        else:
+            values = self._read_chunks(bounds)
+        values = values[tuple(slice(None) if isinstance(key, slice) else 0 for key in index)]
+        return SensitivityGrid(values, axes) if axes else values[()]
+
+    def _read_chunks(self, bounds):
+        # Maps only the chunks overlapping [lo, hi) on every axis. A region inside
+        # one chunk comes back as a view of that chunk's memory map.
+        if any(lo == hi for lo, hi in bounds):
+            return np.empty([hi - lo for lo, hi in bounds], self.dtype)
+        ranges = [range(lo // c, (hi - 1) // c + 1) for (lo, hi), c in zip(bounds, self.chunk_shape)]
+        pieces = []
+        for chunk_index in itertools.product(*ranges):
+            origin = [i * c for i, c in zip(chunk_index, self.chunk_shape)]
+            src = tuple(slice(max(lo, o) - o, min(hi, o + c) - o)
+                        for (lo, hi), o, c in zip(bounds, origin, self.chunk_shape))
+            dst = tuple(slice(max(lo, o) - lo, min(hi, o + c) - lo)
+                        for (lo, hi), o, c in zip(bounds, origin, self.chunk_shape))
+            pieces.append((chunk_index, src, dst))
+        if len(pieces) == 1:
+            chunk_index, src, _ = pieces[0]
+            return self.chunk(chunk_index)[src]
+        out = np.empty([hi - lo for lo, hi in bounds], self.dtype)
+        for chunk_index, src, dst in pieces:
+            out[dst] = self.chunk(chunk_index)[src]
+        return out
+
+
+def open_cube_store(path):
+    return CubeStore(path)
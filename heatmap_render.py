@@ -0,0 +1,147 @@
+import functools
+import io
+
+import matplotlib
+import numpy as np
+import seaborn as sns
+from matplotlib.cm import ScalarMappable
+from matplotlib.colors import Normalize
+from matplotlib.figure import Figure
+from matplotlib.image import NonUniformImage
+
+from sensitivity_grid import AXIS_LABELS
+
+# Heatmaps rendered straight to PNG bytes. Figures are built with the
+# object-oriented Figure API, so they never enter pyplot's figure registry and
+# are freed as soon as the bytes are written; a long-running server can render
+# indefinitely without its memory climbing. The bytes are small and hashable,
+# which makes them cheap to cache next to the grid they were drawn from.
+
+HEATMAP_FIGSIZE = (9, 5)
+HEATMAP_DPI = 100
+# seaborn maps every cell through a QuadMesh, so its drawing time grows with the
+# cell count; past this many cells per side the raster path (one image, colors
+# looked up from a table) is used instead.
+RASTER_MIN_STEPS = 100
+RASTER_LUT_SIZE = 256
+
+
+# -------------------------
+# Heatmap Rendering
+# -------------------------
+def heatmap_png(grid, title, cmap='YlGnBu', center=None, figsize=HEATMAP_FIGSIZE, dpi=HEATMAP_DPI):
+    # grid: a 2-D SensitivityGrid (rows are its first axis, columns its second).
+    fig = Figure(figsize=figsize, dpi=dpi)
+    ax = fig.subplots()
+    sns.heatmap(grid.to_frame(), cmap=cmap, center=center, annot=False, ax=ax)
+    ax.set_title(title, fontsize=14)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', bbox_inches='tight')
+    # Drop the artists now rather than waiting for the garbage collector.
+    fig.clear()
+    return buffer.getvalue()
+
+
+# -------------------------
+# Raster Rendering (large grids)
+# -------------------------
+@functools.lru_cache(maxsize=None)
+def _colormap_lut(cmap):
+    # (RASTER_LUT_SIZE, 4) uint8 RGBA table sampled evenly along the colormap.
+    return matplotlib.colormaps[cmap](np.linspace(0.0, 1.0, RASTER_LUT_SIZE), bytes=True)
+
+
+def _color_limits(values, center=None):
+    # Finite data range; with a center the range is made symmetric around it, so
+    # the center gets the colormap's midpoint (what seaborn's center= does).
+    finite = values[np.isfinite(values)]
+    if finite.size == 0:
+        return 0.0, 1.0
+    vmin, vmax = float(finite.min()), float(finite.max())
+    if center is not None:
+        span = max(vmax - center, center - vmin)
+        vmin, vmax = center - span, center + span
+    return vmin, vmax
+
+
+def heatmap_rgba(values, cmap='YlGnBu', center=None, vmin=None, vmax=None):
+    # (rows, cols, 4) uint8 image of a 2-D array: each value is scaled to a LUT
+    # index and looked up, so the cost is a few passes over the array whatever
+    # its size. Row 0 is the top row, as in the seaborn heatmaps. NaNs come out
+    # transparent. Ready for st.image or imshow.
+    values = np.asarray(values)
+    lo, hi = _color_limits(values, center)
+    lo = lo if vmin is None else vmin
+    hi = hi if vmax is None else vmax
+    scale = (RASTER_LUT_SIZE - 1) / (hi - lo) if hi > lo else 0.0
+
+    index = np.subtract(values, lo, dtype=np.float32)
+    np.multiply(index, scale, out=index)
+    np.clip(index, 0, RASTER_LUT_SIZE - 1, out=index)
+    np.rint(index, out=index)
+    missing = np.isnan(index)
+    index[missing] = 0
+    rgba = _colormap_lut(cmap)[index.astype(np.intp)]
+    rgba[missing] = 0
+    return rgba
+
+
+def _outer_edges(coords):
+    # Outer edges of the first and last cell, with cell boundaries halfway
+    # between neighbouring coordinates (any spacing, either direction).
+    if len(coords) < 2:
+        return coords[0] - 0.5, coords[0] + 0.5
+    return coords[0] - (coords[1] - coords[0]) / 2, coords[-1] + (coords[-1] - coords[-2]) / 2
+
+
+def heatmap_raster_png(grid, title, cmap='YlGnBu', center=None, figsize=HEATMAP_FIGSIZE, dpi=HEATMAP_DPI):
+    # Same figure as heatmap_png (numeric axes, colorbar, title), but the cells
+    # are a single image artist, so rendering time no longer grows with cells.
+    # A NonUniformImage places each cell between the midpoints of its
+    # neighbours, so adaptive grids and T/r cube axes keep their true geometry.
+    if grid.ndim != 2:
+        raise ValueError(f"Heatmaps need a 2-D grid; this one has axes {grid.dims}.")
+    if not _numeric_axes(grid):
+        raise ValueError(f"Raster heatmaps need numeric axes; {grid.dims} includes a label axis.")
+    (row_name, rows), (col_name, cols) = grid.axes.items()
+    vmin, vmax = _color_limits(grid.values, center)
+    fig = Figure(figsize=figsize, dpi=dpi)
+    ax = fig.subplots()
+    rgba = heatmap_rgba(grid.values, cmap, center)
+    # The image wants increasing coordinates; the axis limits restore the grid's
+    # orientation (first row at the top, first column at the left).
+    x, y = cols.astype(float), rows.astype(float)
+    if len(x) > 1 and x[-1] < x[0]:
+        x, rgba = x[::-1], rgba[:, ::-1]
+    if len(y) > 1 and y[-1] < y[0]:
+        y, rgba = y[::-1], rgba[::-1]
+    left, right = _outer_edges(cols)
+    top, bottom = _outer_edges(rows)
+    image = NonUniformImage(ax, interpolation='nearest', extent=(min(left, right), max(left, right),
+                                                                   min(top, bottom), max(top, bottom)))
+    image.set_data(x, y, np.ascontiguousarray(rgba))
+    ax.add_image(image)
+    ax.set_xlim(left, right)
+    ax.set_ylim(bottom, top)
+    fig.colorbar(ScalarMappable(Normalize(vmin, vmax), cmap), ax=ax)
+    ax.set_xlabel(AXIS_LABELS.get(col_name, col_name))
+    ax.set_ylabel(AXIS_LABELS.get(row_name, row_name))
+    ax.set_title(title, fontsize=14)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', bbox_inches='tight')
+    fig.clear()
+    return buffer.getvalue()
+
+
+def _numeric_axes(grid):
+    return all(coords.dtype.kind in 'iuf' for coords in grid.axes.values())
+
+
+def render_heatmap(grid, title, cmap='YlGnBu', center=None, raster=None):
+    # raster=None picks by size: seaborn's labelled cells for small grids, the
+    # single-image path once either side reaches RASTER_MIN_STEPS. Grids with a
+    # label axis (option_type) always go to seaborn, which draws them as categories.
+    if raster is None:
+        raster = max(grid.shape) >= RASTER_MIN_STEPS and _numeric_axes(grid)
+    render = heatmap_raster_png if raster else heatmap_png
+    return render(grid, title, cmap, center)
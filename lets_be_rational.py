@@ -0,0 +1,292 @@
+import numpy as np
+from scipy.special import erf, erfcx, ndtr, ndtri
+
+# Vectorized implied volatility inversion after P. Jaeckel, "Let's Be Rational" (2015).
+#
+# Everything here works in normalised Black space:
+#   x    = ln(F / K)
+#   s    = sigma * sqrt(T)
+#   beta = undiscounted option price / sqrt(F * K)
+# A rational-cubic initial guess (fitted per region of the price curve) is polished
+# with a fixed number of third-order Householder steps; two are enough to reach
+# machine precision, so the cost per quote is small and fixed.
+
+DBL_EPSILON = np.finfo(float).eps
+DBL_MIN = np.finfo(float).tiny
+DBL_MAX = np.finfo(float).max
+SQRT_DBL_MAX = np.sqrt(DBL_MAX)
+
+SQRT_TWO = np.sqrt(2.0)
+SQRT_THREE = np.sqrt(3.0)
+SQRT_ONE_OVER_THREE = np.sqrt(1.0 / 3.0)
+ONE_OVER_SQRT_TWO_PI = 1.0 / np.sqrt(2 * np.pi)
+SQRT_PI_OVER_TWO = np.sqrt(np.pi / 2)
+PI_OVER_SIX = np.pi / 6
+TWO_PI = 2 * np.pi
+TWO_PI_OVER_SQRT_TWENTY_SEVEN = 2 * np.pi / np.sqrt(27.0)
+
+MIN_CONTROL_PARAMETER = -(1 - np.sqrt(DBL_EPSILON))
+MAX_CONTROL_PARAMETER = 2 / (DBL_EPSILON * DBL_EPSILON)
+
+DEFAULT_ITERATIONS = 2
+
+
+# -------------------------
+# Normalised Black Function
+# -------------------------
+def normalised_black_call(x, s):
+    # Normalised out-of-the-money call value for x <= 0.
+    with np.errstate(all='ignore'):
+        h = x / s
+        t = 0.5 * s
+        # Scaled complementary error functions keep full relative precision in the
+        # lower wing, where both terms of the plain formula underflow.
+        b_erfcx = 0.5 * np.exp(-0.5 * (h * h + t * t)) * (erfcx(-(h + t) / SQRT_TWO) - erfcx((t - h) / SQRT_TWO))
+        b_cdf = np.exp(0.5 * x) * ndtr(h + t) - np.exp(-0.5 * x) * ndtr(h - t)
+        b = np.where(h + t <= 1, b_erfcx, b_cdf)
+        b = np.where(x == 0, erf(t / SQRT_TWO), b)
+    return np.where(s > 0, np.maximum(b, 0.0), 0.0)
+
+
+def normalised_vega(x, s):
+    with np.errstate(all='ignore'):
+        vega = ONE_OVER_SQRT_TWO_PI * np.exp(-0.5 * ((x / s) ** 2 + (0.5 * s) ** 2))
+        vega = np.where(x == 0, ONE_OVER_SQRT_TWO_PI * np.exp(-0.125 * s * s), vega)
+    return np.where(s > 0, vega, np.where(x == 0, ONE_OVER_SQRT_TWO_PI, 0.0))
+
+
+def _normalised_intrinsic(x):
+    return 2 * np.sinh(0.5 * np.abs(x))
+
+# -------------------------
+# Rational Cubic Interpolation
+# -------------------------
+def _is_zero(v):
+    return np.abs(v) < DBL_MIN
+
+
+def _rational_cubic_interpolation(x, x_l, x_r, y_l, y_r, d_l, d_r, r):
+    with np.errstate(all='ignore'):
+        h = x_r - x_l
+        t = (x - x_l) / h
+        omt = 1 - t
+        t2 = t * t
+        omt2 = omt * omt
+        cubic = ((y_r * t2 * t + (r * y_r - h * d_r) * t2 * omt + (r * y_l + h * d_l) * t * omt2 + y_l * omt2 * omt)
+                 / (1 + (r - 3) * t * omt))
+        linear = y_r * t + y_l * omt
+    value = np.where(r < MAX_CONTROL_PARAMETER, cubic, linear)
+    return np.where(np.abs(h) > 0, value, 0.5 * (y_l + y_r))
+
+
+def _control_parameter_from_ratio(numerator, denominator):
+    with np.errstate(all='ignore'):
+        ratio = numerator / denominator
+    ratio = np.where(_is_zero(denominator),
+                     np.where(numerator > 0, MAX_CONTROL_PARAMETER, MIN_CONTROL_PARAMETER),
+                     ratio)
+    return np.where(_is_zero(numerator), 0.0, ratio)
+
+
+def _minimum_control_parameter(d_l, d_r, slope, prefer_shape_preservation):
+    monotonic = (d_l * slope >= 0) & (d_r * slope >= 0)
+    convex = (d_l <= slope) & (slope <= d_r)
+    concave = (d_l >= slope) & (slope >= d_r)
+    preferred = MAX_CONTROL_PARAMETER if prefer_shape_preservation else -DBL_MAX
+
+    with np.errstate(all='ignore'):
+        r1 = np.where(_is_zero(slope), preferred, (d_r + d_l) / slope)
+        r1 = np.where(monotonic, r1, -DBL_MAX)
+
+        d_r_m_d_l = d_r - d_l
+        d_r_m_s = d_r - slope
+        s_m_d_l = slope - d_l
+        degenerate = _is_zero(s_m_d_l) | _is_zero(d_r_m_s)
+        r2 = np.where(degenerate, preferred,
+                      np.maximum(np.abs(d_r_m_d_l / d_r_m_s), np.abs(d_r_m_d_l / s_m_d_l)))
+        r2 = np.where(convex | concave, r2, np.where(monotonic, preferred, -DBL_MAX))
+
+    r = np.maximum(MIN_CONTROL_PARAMETER, np.maximum(r1, r2))
+    return np.where(monotonic | convex | concave, r, MIN_CONTROL_PARAMETER)
+
+
+def _convex_control_parameter_left(x_l, x_r, y_l, y_r, d_l, d_r, second_derivative_l, prefer_shape_preservation):
+    with np.errstate(all='ignore'):
+        h = x_r - x_l
+        r = _control_parameter_from_ratio(0.5 * h * second_derivative_l + (d_r - d_l), (y_r - y_l) / h - d_l)
+        r_min = _minimum_control_parameter(d_l, d_r, (y_r - y_l) / h, prefer_shape_preservation)
+    return np.maximum(r, r_min)
+
+
+def _convex_control_parameter_right(x_l, x_r, y_l, y_r, d_l, d_r, second_derivative_r, prefer_shape_preservation):
+    with np.errstate(all='ignore'):
+        h = x_r - x_l
+        r = _control_parameter_from_ratio(0.5 * h * second_derivative_r + (d_r - d_l), d_r - (y_r - y_l) / h)
+        r_min = _minimum_control_parameter(d_l, d_r, (y_r - y_l) / h, prefer_shape_preservation)
+    return np.maximum(r, r_min)
+
+# -------------------------
+# Lower / Upper Wing Transformations
+# -------------------------
+def _f_lower_map(x, s):
+    with np.errstate(all='ignore'):
+        ax = np.abs(x)
+        z = SQRT_ONE_OVER_THREE * ax / s
+        y = z * z
+        s2 = s * s
+        Phi = ndtr(-z)
+        phi = ONE_OVER_SQRT_TWO_PI * np.exp(-0.5 * z * z)
+        fpp = (PI_OVER_SIX * y / (s2 * s) * Phi
+               * (8 * SQRT_THREE * s * ax + (3 * s2 * (s2 - 8) - 8 * x * x) * Phi / phi)
+               * np.exp(2 * y + 0.25 * s2))
+        Phi2 = Phi * Phi
+        fp = TWO_PI * y * Phi2 * np.exp(y + 0.125 * s2)
+        f = TWO_PI_OVER_SQRT_TWENTY_SEVEN * ax * (Phi2 * Phi)
+    flat = s < DBL_MIN
+    fp = np.where(flat, 1.0, fp)
+    f = np.where(flat | (ax < DBL_MIN), 0.0, f)
+    return f, fp, fpp
+
+
+def _inverse_f_lower_map(x, f):
+    with np.errstate(all='ignore'):
+        s = np.abs(x / (SQRT_THREE * ndtri(np.cbrt(f / (TWO_PI_OVER_SQRT_TWENTY_SEVEN * np.abs(x))))))
+    return np.where(f < DBL_MIN, 0.0, s)
+
+
+def _f_upper_map(x, s):
+    with np.errstate(all='ignore'):
+        f = ndtr(-0.5 * s)
+        w = (x / s) ** 2
+        fp = np.where(x == 0, -0.5, -0.5 * np.exp(0.5 * w))
+        fpp = np.where(x == 0, 0.0, SQRT_PI_OVER_TWO * np.exp(w + 0.125 * s * s) * w / s)
+    return f, fp, fpp
+
+
+def _inverse_f_upper_map(f):
+    return -2.0 * ndtri(f)
+
+# -------------------------
+# Householder Iteration
+# -------------------------
+def _householder_factor(newton, halley, hh3):
+    return (1 + 0.5 * halley * newton) / (1 + newton * (halley + hh3 * newton / 6))
+
+
+def normalised_implied_volatility(beta, x, q, iterations=DEFAULT_ITERATIONS):
+    # Returns s = sigma * sqrt(T). NaN marks prices below intrinsic or at/above the
+    # maximum attainable value; a price exactly at intrinsic maps to s = 0.
+    beta, x, q = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (beta, x, q)))
+
+    # Work on the out-of-the-money side and map puts onto calls, so that x <= 0.
+    itm = q * x > 0
+    beta = np.where(itm, beta - _normalised_intrinsic(x), beta)
+    q = np.where(itm, -q, q)
+    x = -np.abs(x)
+
+    below_intrinsic = beta < 0
+    at_intrinsic = beta == 0
+    b_max = np.exp(0.5 * x)
+    above_maximum = beta >= b_max
+    beta = np.where(below_intrinsic | at_intrinsic | above_maximum, 0.5 * b_max, beta)
+
+    with np.errstate(all='ignore'):
+        # Central point: inflection of b(s); tangents from it give the region split.
+        s_c = np.sqrt(np.abs(2 * x))
+        b_c = normalised_black_call(x, s_c)
+        v_c = normalised_vega(x, s_c)
+
+        s_l = s_c - b_c / v_c
+        b_l = normalised_black_call(x, s_l)
+        v_l = normalised_vega(x, s_l)
+
+        s_h = np.where(v_c > DBL_MIN, s_c + (b_max - b_c) / v_c, s_c)
+        b_h = normalised_black_call(x, s_h)
+        v_h = normalised_vega(x, s_h)
+
+        # Lowest region: interpolate the lower map f(beta), then invert it exactly.
+        f_l, fp_l, fpp_l = _f_lower_map(x, s_l)
+        r_ll = _convex_control_parameter_right(0.0, b_l, 0.0, f_l, 1.0, fp_l, fpp_l, True)
+        f = _rational_cubic_interpolation(beta, 0.0, b_l, 0.0, f_l, 1.0, fp_l, r_ll)
+        t = beta / b_l
+        f = np.where(f > 0, f, (f_l * t + b_l * (1 - t)) * t)
+        s_lower = _inverse_f_lower_map(x, f)
+
+        # Two middle regions: interpolate s(beta) directly.
+        r_lm = _convex_control_parameter_right(b_l, b_c, s_l, s_c, 1 / v_l, 1 / v_c, 0.0, False)
+        s_lower_middle = _rational_cubic_interpolation(beta, b_l, b_c, s_l, s_c, 1 / v_l, 1 / v_c, r_lm)
+
+        r_hm = _convex_control_parameter_left(b_c, b_h, s_c, s_h, 1 / v_c, 1 / v_h, 0.0, False)
+        s_upper_middle = _rational_cubic_interpolation(beta, b_c, b_h, s_c, s_h, 1 / v_c, 1 / v_h, r_hm)
+
+        # Highest region: interpolate the upper map f(beta), then invert it exactly.
+        f_h, fp_h, fpp_h = _f_upper_map(x, s_h)
+        r_hh = _convex_control_parameter_left(b_h, b_max, f_h, 0.0, fp_h, -0.5, fpp_h, True)
+        f = _rational_cubic_interpolation(beta, b_h, b_max, f_h, 0.0, fp_h, -0.5, r_hh)
+        f = np.where((fpp_h > -SQRT_DBL_MAX) & (fpp_h < SQRT_DBL_MAX), f, -1.0)
+        h = b_max - b_h
+        t = (beta - b_h) / h
+        f = np.where(f > 0, f, (f_h * (1 - t) + 0.5 * h * t) * (1 - t))
+        s_upper = _inverse_f_upper_map(f)
+
+    lower = beta < b_l
+    lower_middle = ~lower & (beta < b_c)
+    upper_middle = (beta >= b_c) & (beta <= b_h)
+    upper = beta > b_h
+
+    s = np.select([lower, lower_middle, upper_middle], [s_lower, s_lower_middle, s_upper_middle], s_upper)
+    s_left = np.select([lower, lower_middle, upper_middle], [DBL_MIN, s_l, s_c], s_h)
+    s_right = np.select([lower, lower_middle, upper_middle], [s_l, s_c, s_h], DBL_MAX)
+
+    # Objective per region: 1/ln(b) - 1/ln(beta) in the lower wing,
+    # ln(b_max - b) - ln(b_max - beta) in the upper wing, b - beta elsewhere.
+    use_lower_objective = lower
+    use_upper_objective = upper & (beta > 0.5 * b_max)
+
+    ln_beta = np.log(beta)
+    active = np.ones(s.shape, dtype=bool)
+    for iteration in range(iterations):
+        if not active.any():
+            break
+        with np.errstate(all='ignore'):
+            if iteration > 0:
+                s = np.where(active & ~((s > s_left) & (s < s_right)), 0.5 * (s_left + s_right), s)
+
+            b = normalised_black_call(x, s)
+            bp = normalised_vega(x, s)
+            s_right = np.where((b > beta) & (s < s_right), s, s_right)
+            s_left = np.where((b < beta) & (s > s_left), s, s_left)
+            bisection = 0.5 * (s_left + s_right) - s
+
+            h = x / s
+            b_halley = h * h / s - s / 4
+            b_hh3 = b_halley * b_halley - 3 * (h / s) ** 2 - 0.25
+
+            ln_b = np.log(b)
+            bpob = bp / b
+            newton = (ln_beta - ln_b) * ln_b / ln_beta / bpob
+            halley = b_halley - bpob * (1 + 2 / ln_b)
+            hh3 = (b_hh3 + 2 * bpob * bpob * (1 + 3 / ln_b * (1 + 1 / ln_b))
+                   - 3 * b_halley * bpob * (1 + 2 / ln_b))
+            ds_lower = np.where((b > 0) & (bp > 0), newton * _householder_factor(newton, halley, hh3), bisection)
+
+            b_max_minus_b = b_max - b
+            gp = bp / b_max_minus_b
+            newton = -np.log((b_max - beta) / b_max_minus_b) / gp
+            halley = b_halley + gp
+            hh3 = b_hh3 + gp * (2 * gp + 3 * b_halley)
+            ds_upper = np.where((b < b_max) & (bp > DBL_MIN),
+                                newton * _householder_factor(newton, halley, hh3), bisection)
+
+            newton = (beta - b) / bp
+            ds_middle = newton * _householder_factor(newton, b_halley, b_hh3)
+
+            ds = np.select([use_lower_objective, use_upper_objective], [ds_lower, ds_upper], ds_middle)
+            ds = np.where(np.isfinite(ds), ds, bisection)
+            ds = np.where(active, np.maximum(-0.5 * s, ds), 0.0)
+            s = s + ds
+            # Converged quotes are frozen so rounding noise cannot trip the bracket guard.
+            active &= np.abs(ds) > DBL_EPSILON * s
+
+    s = np.where(at_intrinsic, 0.0, s)
+    return np.where(below_intrinsic | above_maximum, np.nan, s)[()]
@@ -0,0 +1,175 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import black_scholes_engine
+from black_scholes_engine import (
+    KERNEL_OUTPUTS,
+    _call_put_sign,
+    black_scholes_kernel,
+    implied_volatility_batch,
+)
+
+# Process-pool execution for books too large for one core. Inputs are copied once
+# into a shared-memory block, workers get only the block names and their chunk
+# bounds, and write results straight into a shared output block, so no array is
+# ever pickled.
+
+DEFAULT_CHUNK_SIZE = 262_144
+# Forking a parent whose Numba/TBB thread pool is already running deadlocks the
+# children, so workers start from a clean interpreter instead.
+DEFAULT_MP_CONTEXT = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+
+# -------------------------
+# Worker Side
+# -------------------------
+def _init_worker():
+    # The pool already uses every core, so Numba's parallel loops run on one
+    # thread per worker; N workers x N Numba threads would oversubscribe.
+    if black_scholes_engine.numba is not None:
+        black_scholes_engine.numba.set_num_threads(1)
+
+
+def _attach_shared_memory(name):
+    # The parent owns (and unlinks) every block. Pool workers share its resource
+    # tracker, so re-registering on attach is harmless before Python 3.13.
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def _run_chunk(op, inputs, out, start, stop, options):
+    columns = inputs[:, start:stop]
+    if op == 'greeks':
+        S, K, T, r, sigma, is_call = columns
+        results = black_scholes_kernel(S, K, T, r, sigma, is_call > 0,
+                                       outputs=options['outputs'], backend=options['backend'])
+        for j, name in enumerate(options['outputs']):
+            out[j, start:stop] = results[name]
+    else:
+        market_price, S, K, T, r, is_call = columns
+        iv, status = implied_volatility_batch(market_price, S, K, T, r, is_call > 0,
+                                              tol=options['tol'], max_iter=options['max_iter'],
+                                              vol_bounds=options['vol_bounds'], backend=options['backend'])
+        out[0, start:stop] = iv
+        out[1, start:stop] = status
+
+
+def _process_chunk(task):
+    op, in_name, out_name, in_shape, out_shape, start, stop, options = task
+    in_shm = _attach_shared_memory(in_name)
+    out_shm = _attach_shared_memory(out_name)
+    try:
+        inputs = np.ndarray(in_shape, dtype=float, buffer=in_shm.buf)
+        out = np.ndarray(out_shape, dtype=float, buffer=out_shm.buf)
+        _run_chunk(op, inputs, out, start, stop, options)
+        # Views must be gone before the blocks can be closed.
+        del inputs, out
+    finally:
+        in_shm.close()
+        out_shm.close()
+    return stop - start
+
+# -------------------------
+# Process Chain Pricer
+# -------------------------
+class ProcessChainPricer:
+    def __init__(self, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, reuse_pool=True, backend=None,
+                 mp_context=DEFAULT_MP_CONTEXT):
+        # workers: pool size (default: all cores); chunk_size: contracts per task;
+        # reuse_pool: keep the worker processes alive between calls;
+        # backend: compute backend used inside each worker (None = auto-dispatch).
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = int(chunk_size)
+        self.reuse_pool = reuse_pool
+        self.backend = backend
+        self.mp_context = mp_context
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _executor(self):
+        if self._pool is None:
+            context = self.mp_context
+            if isinstance(context, str) or context is None:
+                context = multiprocessing.get_context(context)
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                             initializer=_init_worker)
+        return self._pool
+
+    def _run(self, op, columns, n_outputs, options):
+        shape = np.broadcast_shapes(*(c.shape for c in columns))
+        size = int(np.prod(shape))
+        in_shape = (len(columns), size)
+        out_shape = (n_outputs, size)
+
+        # Small books are not worth the process round-trip.
+        if size <= self.chunk_size or self.workers == 1:
+            inputs = np.empty(in_shape)
+            for j, column in enumerate(columns):
+                inputs[j] = np.broadcast_to(column, shape).ravel()
+            out = np.empty(out_shape)
+            _run_chunk(op, inputs, out, 0, size, options)
+            return out.reshape((n_outputs,) + shape)
+
+        in_shm = shared_memory.SharedMemory(create=True, size=8 * in_shape[0] * in_shape[1])
+        out_shm = shared_memory.SharedMemory(create=True, size=8 * out_shape[0] * out_shape[1])
+        try:
+            inputs = np.ndarray(in_shape, dtype=float, buffer=in_shm.buf)
+            for j, column in enumerate(columns):
+                inputs[j] = np.broadcast_to(column, shape).ravel()
+            del inputs
+
+            tasks = [(op, in_shm.name, out_shm.name, in_shape, out_shape, start,
+                      min(start + self.chunk_size, size), options)
+                     for start in range(0, size, self.chunk_size)]
+            done = sum(self._executor().map(_process_chunk, tasks))
+            if done != size:
+                raise RuntimeError(f"Workers priced {done} of {size} contracts.")
+
+            out = np.ndarray(out_shape, dtype=float, buffer=out_shm.buf)
+            result = out.reshape((n_outputs,) + shape).copy()
+            del out
+            return result
+        finally:
+            in_shm.close()
+            in_shm.unlink()
+            out_shm.close()
+            out_shm.unlink()
+            if not self.reuse_pool:
+                self.close()
+
+    def kernel(self, S, K, T, r, sigma, option_type='call', outputs=KERNEL_OUTPUTS):
+        unknown = set(outputs) - set(KERNEL_OUTPUTS)
+        if unknown:
+            raise ValueError(f"Unknown kernel outputs: {sorted(unknown)}. Choose from {KERNEL_OUTPUTS}.")
+        outputs = tuple(outputs)
+        is_call = (_call_put_sign(option_type) > 0).astype(float)
+        columns = [np.asarray(a, dtype=float) for a in (S, K, T, r, sigma)] + [is_call]
+        out = self._run('greeks', columns, len(outputs), {'outputs': outputs, 'backend': self.backend})
+        return {name: out[j][()] for j, name in enumerate(outputs)}
+
+    def price(self, S, K, T, r, sigma, option_type='call'):
+        return self.kernel(S, K, T, r, sigma, option_type, outputs=('price',))['price']
+
+    def implied_volatility(self, market_price, S, K, T, r, option_type='call',
+                           tol=1e-10, max_iter=100, vol_bounds=(1e-6, 10.0)):
+        is_call = (_call_put_sign(option_type) > 0).astype(float)
+        columns = [np.asarray(a, dtype=float) for a in (market_price, S, K, T, r)] + [is_call]
+        options = {'tol': tol, 'max_iter': max_iter, 'vol_bounds': vol_bounds, 'backend': self.backend}
+        out = self._run('iv', columns, 2, options)
+        return out[0][()], out[1].astype(np.int8)[()]
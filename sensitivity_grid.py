@@ -0,0 +1,223 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+# Display names for the engine's parameters when a grid is turned into a frame.
+AXIS_LABELS = {
+    'S': 'Stock Price',
+    'K': 'Strike Price',
+    'T': 'Time to Maturity',
+    'r': 'Risk-Free Rate',
+    'sigma': 'Volatility',
+    'option_type': 'Option Type',
+}
+GRID_INTERP_METHODS = ('linear', 'cubic')
+
+
+# -------------------------
+# Sensitivity Grid
+# -------------------------
+class SensitivityGrid:
+    # Engine results over numeric axes. `values` is the raw ndarray (never copied)
+    # and `axes` maps each dimension name to its coordinates, in dimension order,
+    # e.g. {'sigma': vols, 'S': spots} for a price grid. Nothing is formatted or
+    # labelled until to_frame() is asked for.
+    def __init__(self, values, axes):
+        values = np.asarray(values)
+        axes = {name: np.asarray(coords) for name, coords in axes.items()}
+        if tuple(len(coords) for coords in axes.values()) != values.shape:
+            raise ValueError(f"Axes of lengths {[len(c) for c in axes.values()]} do not match "
+                             f"values of shape {values.shape}.")
+        self.values = values
+        self.axes = axes
+        self._frames = {}
+        self._interpolators = {}
+
+    @property
+    def dims(self):
+        return tuple(self.axes)
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    @property
+    def ndim(self):
+        return self.values.ndim
+
+    @property
+    def dtype(self):
+        return self.values.dtype
+
+    def __array__(self, dtype=None, copy=None):
+        if copy:
+            return np.array(self.values, dtype=dtype)
+        return np.asarray(self.values, dtype=dtype)
+
+    def __repr__(self):
+        axes = ', '.join(f"{name}: {len(c)} [{c[0]:.4g} .. {c[-1]:.4g}]" if len(c) and c.dtype.kind == 'f'
+                         else f"{name}: {len(c)}" for name, c in self.axes.items())
+        return f"SensitivityGrid({self.values.dtype}, {axes})"
+
+    def sel(self, **indexers):
+        # Select by axis value: a number picks the nearest grid point and drops the
+        # axis, a slice(lo, hi) keeps every point in [lo, hi], and labels such as
+        # option_type='put' must match exactly. Results are views.
+        unknown = set(indexers) - set(self.axes)
+        if unknown:
+            raise ValueError(f"Unknown axes: {sorted(unknown)}. Grid axes are {self.dims}.")
+        index, axes = [], {}
+        for name, coords in self.axes.items():
+            if name not in indexers:
+                index.append(slice(None))
+                axes[name] = coords
+            else:
+                position = _axis_index(coords, indexers[name])
+                index.append(position)
+                if isinstance(position, slice):
+                    axes[name] = coords[position]
+        values = self.values[tuple(index)]
+        return SensitivityGrid(values, axes) if axes else values[()]
+
+    def interpolator(self, method='linear'):
+        # Built once per method and kept, since cubic precomputes derivatives.
+        if method not in self._interpolators:
+            self._interpolators[method] = GridInterpolator(self, method)
+        return self._interpolators[method]
+
+    def interp(self, method='linear', **points):
+        # Values between grid points without repricing; see GridInterpolator.
+        return self.interpolator(method)(**points)
+
+    def to_frame(self, fmt='.2f'):
+        # 2-D grids only: rows are the first axis, columns the second, with numeric
+        # coordinates formatted as string labels (the old DataFrame layout) and
+        # label axes such as option_type kept as they are. Built on first use and
+        # cached; the frame shares memory with `values`.
+        if fmt in self._frames:
+            return self._frames[fmt]
+        if self.ndim != 2:
+            raise ValueError(f"to_frame() needs a 2-D grid; this one has axes {self.dims}.")
+        (row_name, rows), (col_name, cols) = self.axes.items()
+        df = pd.DataFrame(self.values, index=_axis_labels(rows, fmt), columns=_axis_labels(cols, fmt), copy=False)
+        df.index.name = AXIS_LABELS.get(row_name, row_name)
+        df.columns.name = AXIS_LABELS.get(col_name, col_name)
+        self._frames[fmt] = df
+        return df
+
+
+def _axis_labels(coords, fmt):
+    if coords.dtype.kind not in 'iuf':
+        return [str(v) for v in coords]
+    return [f"{v:{fmt}}" for v in coords]
+
+
+def _axis_index(coords, key):
+    # Position (int) or range (slice) on one axis for a value-based key.
+    if isinstance(key, slice):
+        return _value_slice(coords, key)
+    if coords.dtype.kind not in 'iuf':
+        matches = np.flatnonzero(coords == key)
+        if matches.size == 0:
+            raise ValueError(f"{key!r} is not on the axis {list(coords)}.")
+        return int(matches[0])
+    return int(np.abs(coords - key).argmin())
+
+
+def _value_slice(coords, key):
+    # Inclusive [start, stop] by value on a monotonic axis, widened by a hair so
+    # that a bound typed as 0.3 still catches the linspace point 0.30000000000000004.
+    if key.step is not None:
+        raise ValueError("Value slices do not take a step.")
+    slack = 1e-9 * abs(coords[-1] - coords[0]) if len(coords) else 0.0
+    ascending = len(coords) < 2 or coords[-1] >= coords[0]
+    ordered = coords if ascending else coords[::-1]
+    lo = 0 if key.start is None else np.searchsorted(ordered, key.start - slack, 'left')
+    hi = len(coords) if key.stop is None else np.searchsorted(ordered, key.stop + slack, 'right')
+    if ascending:
+        return slice(int(lo), int(hi))
+    return slice(len(coords) - int(hi), len(coords) - int(lo))
+
+
+# -------------------------
+# Grid Interpolation
+# -------------------------
+class GridInterpolator:
+    # Batched point lookups on a grid's numeric axes (any spacing, either
+    # direction): 'linear' is multilinear (bilinear on a 2-D grid), 'cubic' is
+    # tensor-product cubic Hermite with slopes from np.gradient (bicubic on a
+    # 2-D grid, continuous first derivatives). Calling it with one array-like per
+    # axis, broadcast together, returns (values, outside): outside flags queries
+    # beyond the grid (or NaN), whose values are NaN, so callers can reprice them.
+    def __init__(self, grid, method='linear'):
+        if method not in GRID_INTERP_METHODS:
+            raise ValueError(f"Invalid method '{method}'. Use one of {GRID_INTERP_METHODS}.")
+        values = np.asarray(grid.values, dtype=float)
+        axes = {}
+        for axis, (name, coords) in enumerate(grid.axes.items()):
+            if coords.dtype.kind not in 'iuf':
+                raise ValueError(f"Axis '{name}' is not numeric; select a single {name} with sel() first.")
+            if len(coords) < 2:
+                raise ValueError(f"Axis '{name}' needs at least two points to interpolate.")
+            coords = coords.astype(float)
+            if coords[-1] < coords[0]:
+                coords, values = coords[::-1], np.flip(values, axis)
+            axes[name] = coords
+        self.axes = axes
+        self.method = method
+        # Derivative tables keyed by the axes differentiated along: just the
+        # values for 'linear', every mixed partial for 'cubic'.
+        orders = [(0,) * len(axes)] if method == 'linear' else list(itertools.product((0, 1), repeat=len(axes)))
+        self._tables = {}
+        for order in orders:
+            table = values
+            for axis, (coords, d) in enumerate(zip(axes.values(), order)):
+                if d:
+                    table = np.gradient(table, coords, axis=axis)
+            self._tables[order] = table
+
+    @property
+    def dims(self):
+        return tuple(self.axes)
+
+    def __call__(self, **points):
+        if set(points) != set(self.axes):
+            raise ValueError(f"Give one coordinate per grid axis {self.dims}; got {sorted(points)}.")
+        queries = np.broadcast_arrays(*(np.asarray(points[name], dtype=float) for name in self.axes))
+        shape = queries[0].shape if queries else ()
+
+        outside = np.zeros(shape, bool)
+        cells, fractions, widths = [], [], []
+        for x, coords in zip(queries, self.axes.values()):
+            outside |= ~((x >= coords[0]) & (x <= coords[-1]))
+            i = np.clip(np.searchsorted(coords, x, 'right') - 1, 0, len(coords) - 2)
+            h = coords[i + 1] - coords[i]
+            cells.append(i)
+            widths.append(h)
+            fractions.append(np.where(outside, 0.0, (x - coords[i]) / h))
+
+        # Per axis and corner (0 = lower, 1 = upper node of the cell), the weight
+        # of each derivative order.
+        weights = [_corner_weights(t, h, self.method) for t, h in zip(fractions, widths)]
+        result = np.zeros(shape)
+        for corner in itertools.product((0, 1), repeat=len(self.axes)):
+            index = tuple(i + c for i, c in zip(cells, corner))
+            for order, table in self._tables.items():
+                term = table[index]
+                for axis_weights, c, d in zip(weights, corner, order):
+                    term = term * axis_weights[c][d]
+                result += term
+        result[outside] = np.nan
+        return result[()], outside[()]
+
+
+def _corner_weights(t, h, method):
+    # weights[corner][order] for one axis: linear hat functions, or the cubic
+    # Hermite basis (value weights h00/h01, slope weights h10/h11 scaled by h).
+    if method == 'linear':
+        return ((1 - t,), (t,))
+    t2 = t * t
+    t3 = t2 * t
+    return ((2 * t3 - 3 * t2 + 1, (t3 - 2 * t2 + t) * h),
+            (3 * t2 - 2 * t3, (t3 - t2) * h))